@@ -3,12 +3,18 @@
 Fetch the last N USDC transfer events from Ethereum using JSON-RPC.
 """
 
-import json
+import aiohttp
+import asyncio
+import msgspec
+import orjson
+import os
+import random
 import re
-import requests
 import sys
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, List, Dict, Any, Literal, Optional, Tuple
 
 
 # USDC contract address on Ethereum mainnet
@@ -21,6 +27,64 @@ TRANSFER_EVENT_SIGNATURE = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628
 INITIAL_CHUNK_SIZE = 100
 MIN_CHUNK_SIZE = 10
 
+# How many block windows to pack into one JSON-RPC batch POST.
+# Alchemy's free tier documents ~10 calls per batch, so stay at that.
+MAX_BATCH_CALLS = 10
+
+# Starting in-flight request count; the scan is embarrassingly parallel
+# across non-overlapping windows but providers cap per-host concurrency,
+# so the RateController adapts this up/down from here
+CONCURRENCY = 32
+
+# Requests per minute budget; conservative default for public endpoints
+RPM_LIMIT = 600
+
+# Latency threshold under which the controller considers the endpoint
+# healthy enough to push more concurrency
+LATENCY_TARGET = 1.0
+
+# Exponential backoff parameters for transient (rate-limit) retries
+RETRY_BASE = 0.25
+RETRY_CAP = 8.0
+
+# How long a cached eth_blockNumber stays fresh (~one Ethereum block)
+LATEST_BLOCK_TTL = 12.0
+
+# LRU entries of (from, to) -> logs kept per paginator so retries and
+# resumed walks don't re-fetch windows we already paid for
+WINDOW_CACHE_SIZE = 128
+
+# Suggested-range pattern some providers embed in range-limit errors
+_RANGE_RE = re.compile(r"(\d+)-(\d+)")
+
+# Documented per-provider eth_getLogs block-range caps; learning the limit
+# by tripping errors wastes a roundtrip per shrink, so hard-cap up front
+# and keep the runtime shrink path only as a safety net
+PROVIDER_LIMITS = {
+    "alchemy.com": 10_000,
+    # hosted endpoints live on *.quiknode.pro (no "c")
+    "quiknode": 10_000,
+    "quicknode": 10_000,
+    "llamarpc": 5_000,
+    "default": 1_000,
+}
+
+
+def _detect_limit(endpoint: str) -> int:
+    for host, limit in PROVIDER_LIMITS.items():
+        if host != "default" and host in endpoint:
+            return limit
+    return PROVIDER_LIMITS["default"]
+
+
+# built once per log, so keep it a slotted struct rather than a dict
+class Transfer(msgspec.Struct, rename={"from_": "from"}):
+    from_: str
+    to: str
+    atoms: int
+    block_number: int
+    transaction_hash: str
+
 
 class RPCError(Exception):
     def __init__(self, error_dict: Dict[str, Any]):
@@ -30,56 +94,276 @@ class RPCError(Exception):
         self.error_dict = error_dict
 
 
+class RateController:
+    """AIMD (additive-increase / multiplicative-decrease) concurrency gate.
+
+    Successful low-latency responses grow the in-flight budget additively;
+    429s/timeouts shrink it multiplicatively, like TCP congestion control.
+    A sliding 60s window of send timestamps also caps requests-per-minute
+    so we never trip the provider's RPM profile in the first place.
+    """
+
+    def __init__(self, rpm_limit: int = RPM_LIMIT, latency_target: float = LATENCY_TARGET):
+        self.c_t = float(CONCURRENCY)
+        self.alpha = 0.5
+        self.beta = 0.5
+        self.c_min = 1
+        self.c_max = 64
+        self.rpm_limit = rpm_limit
+        self.latency_target = latency_target
+        self._sent: deque = deque()
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self.c_t))
+            self._in_flight += 1
+
+        # Sliding-window RPM gate: wait until the oldest send falls out of
+        # the 60s window if we're at budget
+        while True:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] > 60.0:
+                self._sent.popleft()
+            if len(self._sent) < self.rpm_limit:
+                self._sent.append(now)
+                return
+            await asyncio.sleep(self._sent[0] + 60.0 - now)
+
+    async def release(self, latency: Optional[float] = None, throttled: bool = False):
+        async with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.c_t = max(self.c_min, self.c_t * self.beta)
+            elif latency is not None and latency <= self.latency_target:
+                self.c_t = min(self.c_max, self.c_t + self.alpha)
+            self._cond.notify_all()
+
+
 class RPCClient:
     def __init__(self, endpoint: str):
         self.endpoint = endpoint
         self.request_id = 0
-
-    def call(self, method: str, params: List[Any]) -> Any:
+        self.max_range = _detect_limit(endpoint)
+        self.controller = RateController()
+        # (value, monotonic_ts) of the last eth_blockNumber answer
+        self._latest_block: Optional[Tuple[int, float]] = None
+        self._logged_encoding = False
+        # Created lazily so construction doesn't require a running loop
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            # One pooled keep-alive connector; without it every chunk pays
+            # a fresh TCP+TLS handshake. Hex-heavy getLogs JSON gzips
+            # 5-10x, so ask for compressed responses explicitly (aiohttp
+            # decompresses transparently)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=30),
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept-Encoding": "gzip, deflate"
+                }
+            )
+        return self.session
+
+    def _next_id(self) -> int:
         self.request_id += 1
+        return self.request_id
+
+    async def _post(self, payload: Any) -> Any:
+        await self.controller.acquire()
+        throttled = False
+        latency = None
+        try:
+            start = time.monotonic()
+            # orjson for both directions: getLogs responses can be tens of
+            # MB of hex-heavy JSON and stdlib json dominates CPU there
+            async with self._get_session().post(self.endpoint, data=orjson.dumps(payload)) as response:
+                if response.status == 429:
+                    throttled = True
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", 1.0))
+                    except ValueError:
+                        # RFC 7231 also allows an HTTP-date here
+                        retry_after = 1.0
+                    raise RPCError({
+                        "code": 429,
+                        "message": "rate limited",
+                        "retry_after": retry_after
+                    })
+                # Provider told us the budget is gone even though this one
+                # got through; treat it like a throttle for pacing purposes
+                if response.headers.get("x-ratelimit-remaining") == "0":
+                    throttled = True
+                response.raise_for_status()
+                # Debug path to confirm the endpoint actually compresses
+                if os.environ.get("RPC_DEBUG") and not self._logged_encoding:
+                    self._logged_encoding = True
+                    print(f"  response content-encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                result = orjson.loads(await response.read())
+                latency = time.monotonic() - start
+                return result
+        except asyncio.TimeoutError:
+            throttled = True
+            raise
+        finally:
+            await self.controller.release(latency=latency, throttled=throttled)
+
+    async def call(self, method: str, params: List[Any]) -> Any:
         payload = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": self._next_id(),
             "method": method,
             "params": params
         }
 
-        response = requests.post(self.endpoint, json=payload)
-        response.raise_for_status()
-
-        result = response.json()
+        result = await self._post(payload)
         if "error" in result:
             raise RPCError(result['error'])
 
         return result.get("result")
 
+    async def call_batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """Send several calls as one JSON-RPC 2.0 batch (one HTTP roundtrip).
+
+        Returns results in the same order as `calls`. Raises RPCError if any
+        entry in the batch failed.
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": params}
+            for method, params in calls
+        ]
+
+        response = await self._post(payload)
+        # A server that rejects the batch as a whole (e.g. over its
+        # batch-size limit) answers with a single error object, not an array
+        if not isinstance(response, list):
+            raise RPCError(response.get("error", {"message": "malformed batch response"}))
+
+        # Batch responses are not guaranteed to come back in request order,
+        # so realign on id before unpacking
+        by_id = {entry.get("id"): entry for entry in response}
+        results = []
+        for request in payload:
+            entry = by_id.get(request["id"])
+            if entry is None:
+                raise RPCError({"message": f"missing batch response for id {request['id']}"})
+            if "error" in entry:
+                raise RPCError(entry["error"])
+            results.append(entry.get("result"))
+        return results
+
+    async def latest_block(self) -> int:
+        """eth_blockNumber with a ~one-block TTL cache.
+
+        Repeated scans against the same client (e.g. from a service loop)
+        reuse the cached tip instead of paying a roundtrip per invocation.
+        """
+        now = time.monotonic()
+        if self._latest_block is not None and now - self._latest_block[1] < LATEST_BLOCK_TTL:
+            return self._latest_block[0]
+
+        block = int(await self.call("eth_blockNumber", []), 16)
+        self._latest_block = (block, now)
+        return block
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+
+def classify(err: RPCError) -> Literal["range", "ratelimit", "fatal"]:
+    """Sort an RPC error into how the retry loop should react.
+
+    Range-looking messages win first: -32005 "limit exceeded" is used both
+    for result caps and throttling, and a result cap must shrink the
+    window, not wait. Otherwise codes decide (providers are more
+    consistent about codes than prose), with substring matching last.
+    """
+    message = err.message.lower()
+    if "range" in message or "max results" in message:
+        return "range"
+    if err.code in (429, -32005) or "rate limit" in message or "too many requests" in message:
+        return "ratelimit"
+    return "fatal"
 
-def parse_log_entry(log: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse a single log entry into a transfer record."""
-    block_number = int(log["blockNumber"], 16)
 
-    # Extract from and to addresses from topics
-    from_address = "0x" + log["topics"][1][-40:]
-    to_address = "0x" + log["topics"][2][-40:]
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter to avoid thundering-herd retries."""
+    return min(RETRY_CAP, RETRY_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def pad32(addr: str) -> str:
+    """Left-pad an address to the 32-byte word format used in topics."""
+    return "0x" + addr[2:].lower().zfill(64)
+
 
-    # Extract value from data (uint256, 32 bytes)
-    value_hex = log["data"]
-    value_atoms = int(value_hex, 16)
+def make_topics(
+    from_addrs: Optional[List[str]] = None,
+    to_addrs: Optional[List[str]] = None
+) -> List[Any]:
+    """Topic filter with optional indexed from/to constraints.
 
+    Entries within a position OR together per standard topic semantics;
+    constraining them server-side shrinks responses from "every USDC
+    transfer in the window" to just the matches.
+    """
+    topics: List[Any] = [TRANSFER_EVENT_SIGNATURE]
+    if from_addrs or to_addrs:
+        topics.append([pad32(a) for a in from_addrs] if from_addrs else None)
+    if to_addrs:
+        topics.append([pad32(a) for a in to_addrs])
+    return topics
+
+
+def make_log_filter(
+    from_block: int,
+    to_block: int,
+    topics: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """Build the eth_getLogs filter object for a block window."""
     return {
-        "from": from_address,
-        "to": to_address,
-        "atoms": value_atoms,
-        "block_number": block_number,
-        "transaction_hash": log["transactionHash"]
+        "fromBlock": hex(from_block),
+        "toBlock": hex(to_block),
+        "address": USDC_ADDRESS,
+        "topics": topics if topics is not None else [TRANSFER_EVENT_SIGNATURE]
     }
 
 
-def fetch_logs_with_retry(
+def hex_to_int(h: str) -> int:
+    """Decode a 0x-prefixed hex quantity.
+
+    int.from_bytes(bytes.fromhex(...)) is a single C-level parse, cheaper
+    than the general-purpose int(str, 16) when a chunk returns thousands
+    of logs. Quantities may have an odd digit count, so pad to a byte.
+    """
+    h = h[2:]
+    if len(h) & 1:
+        h = "0" + h
+    return int.from_bytes(bytes.fromhex(h), 'big')
+
+
+def parse_log_entry(log: Dict[str, Any]) -> Transfer:
+    """Parse a single log entry into a transfer record."""
+    return Transfer(
+        # addresses live in the low 20 bytes of the 32-byte topic words
+        from_="0x" + log["topics"][1][26:],
+        to="0x" + log["topics"][2][26:],
+        # value is the uint256 data word
+        atoms=hex_to_int(log["data"]),
+        block_number=hex_to_int(log["blockNumber"]),
+        transaction_hash=log["transactionHash"]
+    )
+
+
+async def fetch_logs_with_retry(
     client: RPCClient,
     from_block: int,
     to_block: int,
-    max_retries: int = 3
+    max_retries: int = 5,
+    topics: Optional[List[Any]] = None
 ) -> Tuple[List[Dict[str, Any]], int]:
     """
     Fetch logs with automatic retry and chunk size reduction on errors.
@@ -88,24 +372,25 @@ def fetch_logs_with_retry(
         Tuple of (logs, next_from_block)
     """
     chunk_size = to_block - from_block
+    last_err: Optional[RPCError] = None
 
     for attempt in range(max_retries):
         try:
-            filter_params = {
-                "fromBlock": hex(from_block),
-                "toBlock": hex(to_block),
-                "address": USDC_ADDRESS,
-                "topics": [TRANSFER_EVENT_SIGNATURE]
-            }
-
-            logs = client.call("eth_getLogs", [filter_params])
+            logs = await client.call("eth_getLogs", [make_log_filter(from_block, to_block, topics)])
             return logs, from_block - 1
 
         except RPCError as e:
-            # Check if error is about too many results or too large range
-            if "range" in e.message.lower() or "max results" in e.message.lower():
+            kind = classify(e)
+            if kind == "fatal":
+                raise
+            last_err = e
+            if kind == "ratelimit":
+                # Controller already shrank the in-flight budget; honor the
+                # provider's Retry-After if given, else back off with jitter
+                await asyncio.sleep(e.error_dict.get("retry_after") or backoff_delay(attempt))
+            else:
                 # Try to extract suggested range from error message
-                match = re.search(r'(\d+)-(\d+)', e.message)
+                match = _RANGE_RE.search(e.message)
                 if match:
                     suggested_from = int(match.group(1))
                     suggested_to = int(match.group(2))
@@ -125,105 +410,307 @@ def fetch_logs_with_retry(
                     print(f"  Chunk size too small, skipping block range")
                     return [], from_block - 1
 
-                time.sleep(0.5)  # Brief delay before retry
-            else:
-                raise
+    # Out of retries: a still-throttled window must fail loudly rather
+    # than masquerade as an empty range; only range errors keep the skip
+    if last_err is not None and classify(last_err) == "ratelimit":
+        raise last_err
 
-    # If all retries failed
     print(f"  Failed after {max_retries} attempts, skipping range")
     return [], from_block - 1
 
 
-def fetch_usdc_transfers(rpc_endpoint: str, num_events: int) -> Dict[str, Any]:
+@dataclass
+class StreamState:
+    """Scan cursor; every block above last_seen_block has been yielded."""
+    last_seen_block: int
+
+
+@dataclass
+class StreamOptions:
+    block_stride: int = INITIAL_CHUNK_SIZE
+    # Pack windows into JSON-RPC batch POSTs; otherwise one POST per window
+    use_batch: bool = True
+    # Topic filter for every window; None means all Transfer events
+    topics: Optional[List[Any]] = None
+
+
+@dataclass
+class StreamBatch:
+    """One successfully fetched window of logs plus the resume cursor."""
+    logs: List[Dict[str, Any]]
+    state: StreamState
+    block_range: Tuple[int, int]
+
+
+class LogsPaginator:
+    """Resumable backward paginator over eth_getLogs windows.
+
+    Owns stride sizing (growth on success, shrink on range errors via
+    fetch_logs_with_retry), wave scheduling, and the resume cursor.
+    Consumers just iterate StreamBatches newest-first and stop whenever
+    they have enough; breaking out cancels anything still in flight.
+    Pass state_path to persist the cursor so a failed job can resume.
+    """
+
+    def __init__(
+        self,
+        client: RPCClient,
+        options: Optional[StreamOptions] = None,
+        state_path: Optional[str] = None
+    ):
+        self.client = client
+        self.options = options or StreamOptions()
+        self.state_path = state_path
+        # (from, to) -> (logs, next_from_block), LRU-bounded
+        self._window_cache: OrderedDict = OrderedDict()
+
+    def _load_state(self) -> Optional[StreamState]:
+        if self.state_path is None or not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, 'rb') as f:
+            return StreamState(**orjson.loads(f.read()))
+
+    def _save_state(self, state: StreamState):
+        if self.state_path is None:
+            return
+        with open(self.state_path, 'wb') as f:
+            f.write(orjson.dumps(asdict(state)))
+
+    def _cache_put(self, key: Tuple[int, int], value: Tuple[List[Dict[str, Any]], int]):
+        self._window_cache[key] = value
+        self._window_cache.move_to_end(key)
+        while len(self._window_cache) > WINDOW_CACHE_SIZE:
+            self._window_cache.popitem(last=False)
+
+    async def _fetch_group(self, group: List[Tuple[int, int]]) -> List[Tuple[List[Dict[str, Any]], int]]:
+        """Fetch a group of windows, batched into one POST when possible.
+
+        Windows already in the LRU (re-walked after a range split, or an
+        identical window from a resumed run) are served without a request.
+        Returns [(logs, next_from_block)] aligned with `group`.
+        """
+        misses = [w for w in group if w not in self._window_cache]
+
+        if self.options.use_batch and len(misses) > 1:
+            try:
+                results = await self.client.call_batch([
+                    ("eth_getLogs", [make_log_filter(f, t, self.options.topics)])
+                    for f, t in misses
+                ])
+                for (f, t), logs in zip(misses, results):
+                    self._cache_put((f, t), (logs, f - 1))
+                misses = []
+            except RPCError as e:
+                if classify(e) == "fatal":
+                    raise
+                # Some window tripped a range/result limit; fall through to
+                # the per-window shrinking retry path
+
+        for from_block, to_block in misses:
+            self._cache_put(
+                (from_block, to_block),
+                await fetch_logs_with_retry(
+                    self.client, from_block, to_block, topics=self.options.topics
+                )
+            )
+
+        out = []
+        for key in group:
+            self._window_cache.move_to_end(key)
+            out.append(self._window_cache[key])
+        return out
+
+    async def paginate(self, start_block: Optional[int] = None) -> AsyncIterator[StreamBatch]:
+        stride = min(self.options.block_stride, self.client.max_range)
+
+        resumed = self._load_state()
+        if resumed is not None:
+            current = resumed.last_seen_block
+            print(f"Resuming scan from block {current}")
+        elif start_block is not None:
+            current = start_block
+        else:
+            current = await self.client.latest_block()
+
+        while current > 0:
+            # Speculatively build a wave of descending windows, grouped into
+            # batch POSTs that run concurrently under the rate controller
+            windows = []
+            block = current
+            while len(windows) < CONCURRENCY and block > 0:
+                from_block = max(0, block - stride)
+                windows.append((from_block, block))
+                block = from_block - 1
+
+            print(f"Querying blocks {windows[-1][0]} to {windows[0][1]} ({len(windows)} windows of ~{stride} blocks)...")
+
+            group_size = MAX_BATCH_CALLS if self.options.use_batch else 1
+            groups = [windows[i:i + group_size] for i in range(0, len(windows), group_size)]
+            tasks = [asyncio.create_task(self._fetch_group(g)) for g in groups]
+
+            found = 0
+            shrunk = False
+            try:
+                for task, group in zip(tasks, groups):
+                    if shrunk:
+                        break
+                    for (from_block, to_block), (logs, next_from) in zip(group, await task):
+                        found += len(logs)
+                        current = next_from
+                        state = StreamState(last_seen_block=next_from)
+                        self._save_state(state)
+                        # next_from + 1 is the lowest block this window
+                        # actually covered (== from_block unless it shrank)
+                        yield StreamBatch(logs=logs, state=state, block_range=(next_from + 1, to_block))
+                        if next_from != from_block - 1:
+                            # The window shrank under a range/result cap, so
+                            # the rest of the wave was planned against blocks
+                            # it never covered; drop the wave and restart the
+                            # walk from the actual cursor
+                            shrunk = True
+                            break
+            finally:
+                # Consumer may have broken out mid-wave; drop the rest
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if found:
+                # Adaptive stride: grow while windows keep returning results,
+                # but never past the provider's documented range cap
+                stride = min(self.client.max_range, int(stride * 1.5))
+
+
+def fetch_usdc_transfers(
+    rpc_endpoint: str,
+    num_events: int,
+    from_addrs: Optional[List[str]] = None,
+    to_addrs: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Fetch the last N USDC transfer events from Ethereum.
 
     Args:
         rpc_endpoint: Ethereum JSON-RPC endpoint URL
         num_events: Number of transfer events to fetch
+        from_addrs: Optional sender addresses to filter server-side
+        to_addrs: Optional recipient addresses to filter server-side
 
     Returns:
         Dictionary containing transfers and block range
     """
-    client = RPCClient(rpc_endpoint)
+    return asyncio.run(fetch_usdc_transfers_async(rpc_endpoint, num_events, from_addrs, to_addrs))
 
-    # Get the latest block number
-    latest_block_hex = client.call("eth_blockNumber", [])
-    latest_block = int(latest_block_hex, 16)
-    print(f"Latest block: {latest_block}\n")
 
-    all_transfers = []
-    current_block = latest_block
-    chunk_size = INITIAL_CHUNK_SIZE
+async def fetch_usdc_transfers_async(
+    rpc_endpoint: str,
+    num_events: int,
+    from_addrs: Optional[List[str]] = None,
+    to_addrs: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    client = RPCClient(rpc_endpoint)
+    try:
+        return await _fetch_usdc_transfers(client, num_events, from_addrs, to_addrs)
+    finally:
+        await client.close()
 
-    # Fetch events in chunks going backwards
-    while len(all_transfers) < num_events and current_block > 0:
-        to_block = current_block
-        from_block = max(0, current_block - chunk_size)
 
-        print(f"[{len(all_transfers)}/{num_events}] Querying blocks {from_block} to {to_block} ({to_block - from_block} blocks)...")
+async def _fetch_usdc_transfers(
+    client: RPCClient,
+    num_events: int,
+    from_addrs: Optional[List[str]] = None,
+    to_addrs: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    # Get the latest block number (cached ~one block on the client)
+    latest_block = await client.latest_block()
+    print(f"Latest block: {latest_block}\n")
 
-        logs, next_block = fetch_logs_with_retry(client, from_block, to_block)
+    all_transfers = []
+    # Track the block range in the same pass instead of re-walking the
+    # list twice with min()/max() at the end
+    min_block = None
+    max_block = None
+    paginator = LogsPaginator(
+        client,
+        StreamOptions(topics=make_topics(from_addrs, to_addrs))
+    )
+    stream = paginator.paginate(start_block=latest_block)
 
-        if logs:
-            print(f"  Found {len(logs)} events")
+    try:
+        # Windows stream newest-first; stop the moment we have enough
+        async for batch in stream:
+            if batch.logs:
+                print(f"  Found {len(batch.logs)} events in blocks {batch.block_range[0]}-{batch.block_range[1]}")
 
-            # Process logs in reverse order (newest first)
-            for log in reversed(logs):
+            # Process this window's logs in reverse order (newest first)
+            for log in reversed(batch.logs):
                 if len(all_transfers) >= num_events:
                     break
-                all_transfers.append(parse_log_entry(log))
-
-            # Adaptive chunk sizing: increase if we got results successfully
-            chunk_size = min(1000, int(chunk_size * 1.5))
-        else:
-            print(f"  No events found")
-
-        current_block = next_block
-
-        if current_block <= 0:
-            print("\nReached genesis block")
-            break
-
-    # Trim to exactly N events
-    all_transfers = all_transfers[:num_events]
-
-    # Calculate actual block range
-    if all_transfers:
-        actual_min_block = min(t["block_number"] for t in all_transfers)
-        actual_max_block = max(t["block_number"] for t in all_transfers)
-    else:
-        actual_min_block = latest_block
-        actual_max_block = latest_block
+                transfer = parse_log_entry(log)
+                all_transfers.append(transfer)
+                block_number = transfer.block_number
+                if min_block is None or block_number < min_block:
+                    min_block = block_number
+                if max_block is None or block_number > max_block:
+                    max_block = block_number
+
+            if len(all_transfers) >= num_events:
+                break
+    finally:
+        # Close the stream deterministically so in-flight window tasks are
+        # cancelled the moment the target is met, not at GC time
+        await stream.aclose()
+
+    if len(all_transfers) < num_events:
+        print("\nReached genesis block")
 
     return {
         "block_range": {
-            "from_block": actual_min_block,
-            "to_block": actual_max_block
+            "from_block": min_block if min_block is not None else latest_block,
+            "to_block": max_block if max_block is not None else latest_block
         },
         "total_events": len(all_transfers),
-        "transfers": [
-            {
-                "from": t["from"],
-                "to": t["to"],
-                "atoms": t["atoms"]
-            }
-            for t in all_transfers
-        ],
         "transfers_with_metadata": all_transfers  # Including block number and tx hash
     }
 
 
+def save_result(result: Dict[str, Any], output_file: str):
+    """Write the scan result to disk.
+
+    A .jsonl target streams one transfer per line — no whole-document
+    buffer, so peak memory stays flat for large scans. Any other
+    extension keeps the original single pretty-printed JSON document.
+    """
+    with open(output_file, 'wb') as f:
+        if output_file.endswith(".jsonl"):
+            for t in result["transfers_with_metadata"]:
+                f.write(msgspec.json.encode(t))
+                f.write(b"\n")
+        else:
+            # The trimmed "transfers" view is projected only here at dump
+            # time instead of being carried as a second list in result
+            doc = msgspec.json.encode({
+                **result,
+                "transfers": [
+                    {"from": t.from_, "to": t.to, "atoms": t.atoms}
+                    for t in result["transfers_with_metadata"]
+                ],
+            })
+            f.write(msgspec.json.format(doc, indent=2))
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: python fetch_usdc_transfers.py <RPC_ENDPOINT> <NUM_EVENTS> [OUTPUT_FILE]")
+        print("\nOUTPUT_FILE ending in .jsonl streams one transfer per line;")
+        print("a .json target writes the combined document.")
         print("\nExample:")
-        print("  python fetch_usdc_transfers.py https://eth.llamarpc.com 100 output.json")
+        print("  python fetch_usdc_transfers.py https://eth.llamarpc.com 100 output.jsonl")
         sys.exit(1)
 
     rpc_endpoint = sys.argv[1]
     num_events = int(sys.argv[2])
-    output_file = sys.argv[3] if len(sys.argv) > 3 else "usdc_transfers.json"
+    output_file = sys.argv[3] if len(sys.argv) > 3 else "usdc_transfers.jsonl"
 
     print(f"Fetching last {num_events} USDC transfers from Ethereum...")
     print(f"RPC Endpoint: {rpc_endpoint}")
@@ -232,9 +719,7 @@ def main():
     try:
         result = fetch_usdc_transfers(rpc_endpoint, num_events)
 
-        # Save to JSON
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        save_result(result, output_file)
 
         print(f"\n✓ Successfully fetched {result['total_events']} transfers")
         print(f"✓ Block range: {result['block_range']['from_block']} to {result['block_range']['to_block']}")
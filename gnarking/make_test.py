@@ -1,7 +1,8 @@
-import os, json
+import json
 from pathlib import Path
+from string import Template
 
-TEMPLATE = """
+TEMPLATE = Template("""
 // SPDX-License-Identifier: UNLICENSED
 pragma solidity ^0.8.13;
 
@@ -17,13 +18,13 @@ contract VerifierTest is Test {
 
     function test_Verify() public {
         // generated with `make_test.py`
-        uint256[8] memory proof = <PROOF>;
-        uint256[7] memory input = <INPUT>;
+        uint256[8] memory proof = ${PROOF};
+        uint256[7] memory input = ${INPUT};
         uint256[4] memory compressed = ver.compressProof(proof);
         ver.verifyCompressedProof(compressed, input);
     }
 }
-"""
+""")
 
 BASE = Path("./artifact")
 BASE_SOL = Path("./ddn")
@@ -33,26 +34,15 @@ VERIFIER_PATH = BASE / "settlement_verifier_8.sol"
 VERIFIER_TGT_PATH = BASE_SOL / "src" / "settlement_verifier_8.sol"
 TEST_TGT_PATH = BASE_SOL / "test" / "settlement_verifier_8.sol"
 
-verifier = ""
-with open(VERIFIER_PATH) as f:
-    verifier = f.read()
-with open(VERIFIER_TGT_PATH, "w") as f:
-    f.write(verifier)
+VERIFIER_TGT_PATH.write_text(VERIFIER_PATH.read_text())
 
-proof = []
-input = []
-with open(PROOF_PATH) as f:
-    proof = json.load(f)
-with open(INPUT_PATH) as f:
-    input = json.load(f)
+proof = json.loads(PROOF_PATH.read_text())
+input = json.loads(INPUT_PATH.read_text())
 
 def arr_u256(v):
-    return "[\n" + ",\n".join(v) + "\n]"
+    return "[\n{}\n]".format(",\n".join(v))
 
-res = (TEMPLATE
-       .replace("<PROOF>", arr_u256(proof))
-       .replace("<INPUT>", arr_u256(input))
-)
+# single-pass substitution instead of chained .replace() scans
+res = TEMPLATE.substitute(PROOF=arr_u256(proof), INPUT=arr_u256(input))
 
-with open(TEST_TGT_PATH, "w") as f:
-    f.write(res)
\ No newline at end of file
+TEST_TGT_PATH.write_text(res)
@@ -1,4 +1,6 @@
 #!/bin/bash
 
 # uv venv
-uv pip install plotly pandas
+uv pip install plotly pandas msgspec
+# for coproc/research/fetch_usdc_transfers.py
+uv pip install aiohttp orjson
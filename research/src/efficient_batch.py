@@ -1,25 +1,22 @@
+import numpy as np
 import plotly.express as px
 import pandas as pd
 
 # https://arbiscan.io/tx/0x323321b6f3953817b707b4060759203ac5a7c0f44fe3aca6441dd22c1d4667db
 # proof verification costs $0.009235
 # what is the first efficient batch size?
-BATCH_SIZE = [2**i for i in range(1,9)]
+BATCH_SIZE = np.array([2**i for i in range(1,9)])
 MIN_PAY_SIZE = 0.5 / 100 # half cent
 PROOF_COST = 0.9235 / 100
 
 if __name__ == "__main__":
     print(BATCH_SIZE)
-    res = []
-    for size in BATCH_SIZE:
-        min_val = MIN_PAY_SIZE * size
-        res.append({
-            "size": size,
-            "proof_frac_of_val": PROOF_COST / min_val
-        })
-
-
-    df = pd.DataFrame(res)
+    # vectorized; generalizes to sweeping MIN_PAY_SIZE/PROOF_COST grids
+    # (np.multiply.outer) without a python loop
+    df = pd.DataFrame({
+        "size": BATCH_SIZE,
+        "proof_frac_of_val": PROOF_COST / (MIN_PAY_SIZE * BATCH_SIZE)
+    })
     fig = px.line(df, x="size", y="proof_frac_of_val")
     fig.show()
 